@@ -0,0 +1,179 @@
+import os
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+import mimetypes
+import pathlib
+import argparse
+import subprocess
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Build step for the static folder, run before starting the server:
+#   python -m app.assets
+# 1. Compiles app/static/src/tailwind.css with the Tailwind v3 CLI, keeping only the
+#    classes used in app/templates (set TAILWIND_BIN if the binary is not on PATH).
+#    v4 dropped --config and the @tailwind directives this build relies on.
+# 2. Copies every static file into static/dist/ under a content-hashed name, with
+#    .gz (and .br when the brotli package is installed) siblings for text files.
+# 3. Writes static/dist/manifest.json, which static_url() uses to link the hashed names.
+ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent
+STATIC_DIR = pathlib.Path(__file__).resolve().parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+TAILWIND_BIN = os.environ.get("TAILWIND_BIN", "tailwindcss")
+TAILWIND_RELEASE = "https://github.com/tailwindlabs/tailwindcss/releases/tag/v3.4.17"
+TAILWIND_CONFIG = ROOT_DIR / "tailwind.config.js"
+TAILWIND_INPUT = STATIC_DIR / "src" / "tailwind.css"
+TAILWIND_OUTPUT = STATIC_DIR / "tailwind.css"
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".html", ".json", ".txt"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def load_manifest() -> dict[str, str]:
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+manifest = load_manifest()
+
+
+def static_url(path: str) -> str:
+    """URL of a file in app/static, pointing at its fingerprinted copy once built."""
+    if path in manifest:
+        return f"/static/dist/{manifest[path]}"
+    return f"/static/{path}"
+
+
+def accepted_encodings(header: str) -> set[str]:
+    weights = {}
+    for token in header.split(","):
+        name, _, params = token.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = params.strip().lower().removeprefix("q=")
+        try:
+            weights[name] = float(q) if q else 1.0
+        except ValueError:
+            weights[name] = 1.0
+
+    accepted = {name for name, weight in weights.items() if weight > 0}
+    # "*" covers every coding the client didn't list, explicit q=0 entries stay excluded
+    if weights.get("*", 0) > 0:
+        accepted |= {coding for coding in ("br", "gzip") if coding not in weights}
+    return accepted
+
+
+class StaticAssets(StaticFiles):
+    """StaticFiles that serves pre-built .br/.gz variants and caches fingerprinted files forever."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Known once at startup so requests never stat() for a missing variant
+        self.encoded = {str(p): p.stat() for p in DIST_DIR.rglob("*") if p.suffix in (".br", ".gz")}
+
+    def file_response(self, full_path, stat_result, scope, status_code=200) -> Response:
+        full_path = str(full_path)
+        fingerprinted = full_path.startswith(str(DIST_DIR) + os.sep)
+        if not fingerprinted:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+
+        headers = {"Cache-Control": IMMUTABLE}
+        media_type = None
+        has_variants = False
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if full_path + suffix in self.encoded:
+                has_variants = True
+                if encoding in accepted:
+                    media_type = mimetypes.guess_type(full_path)[0]
+                    full_path += suffix
+                    stat_result = self.encoded[full_path]
+                    headers["Content-Encoding"] = encoding
+                    break
+        if has_variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        response = FileResponse(
+            full_path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def build_css():
+    print(f"🎨 Compiling {TAILWIND_INPUT.relative_to(ROOT_DIR)} with {TAILWIND_BIN}...")
+    try:
+        subprocess.run([
+            TAILWIND_BIN,
+            "--config", str(TAILWIND_CONFIG),
+            "--input", str(TAILWIND_INPUT),
+            "--output", str(TAILWIND_OUTPUT),
+            "--minify",
+        ], check=True, cwd=ROOT_DIR)  # the config's content glob is relative to the working directory
+    except FileNotFoundError:
+        sys.exit(
+            f"❌ {TAILWIND_BIN} not found. Download the v3.4 standalone Tailwind CLI "
+            f"({TAILWIND_RELEASE}) and set TAILWIND_BIN, "
+            "or pass --skip-css to keep the CDN build."
+        )
+
+
+def fingerprint() -> dict[str, str]:
+    shutil.rmtree(DIST_DIR, ignore_errors=True)
+    built = {}
+
+    for source in sorted(STATIC_DIR.rglob("*")):
+        rel = source.relative_to(STATIC_DIR)
+        if not source.is_file() or rel.parts[0] in ("dist", "src"):
+            continue
+
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        hashed = rel.with_name(f"{source.stem}.{digest}{source.suffix}")
+        target = DIST_DIR / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        built[rel.as_posix()] = hashed.as_posix()
+
+        if source.suffix not in COMPRESSIBLE:
+            continue
+        # mtime=0 keeps the .gz bytes identical across builds of the same file
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                target.with_name(target.name + suffix).write_bytes(compressed)
+
+    MANIFEST_PATH.write_text(json.dumps(built, indent=2, sort_keys=True))
+    return built
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Zouk static assets")
+    parser.add_argument("--skip-css", action="store_true", help="don't run the Tailwind CLI")
+    args = parser.parse_args()
+
+    if not args.skip_css:
+        build_css()
+    built = fingerprint()
+    if brotli is None:
+        print("ℹ️ brotli is not installed, only .gz variants were written")
+    print(f"✅ {len(built)} files written to {DIST_DIR.relative_to(ROOT_DIR)}")
@@ -0,0 +1,352 @@
+import json
+import time
+import random
+import asyncio
+import pathlib
+import sqlite3
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from app import db, state
+
+# Benchmark for the SQL behind the game pages, run against a scratch database:
+#   python -m app.bench --sizes 100,1000,5000 --json bench.json
+# Synthetic games are added in steps up to each size. After each step every
+# production query is timed, and the query plans are printed at the end.
+DEFAULT_DB = pathlib.Path("/tmp/zouk-bench.db")
+
+# The statements exactly as main.py / state.py run them. Writes (UPDATE/INSERT) are timed
+# inside a transaction that is rolled back after each run, so the data stays the same.
+QUERIES = {
+    "latest_game": (
+        "SELECT id, round_number, game_status FROM game ORDER BY created_at DESC LIMIT 1",
+        lambda ctx: (),
+    ),
+    "game_players": (
+        "SELECT id, name, seat_number FROM players WHERE game_id = ?",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "player_total": (
+        "SELECT SUM(points) AS total_score FROM scores WHERE player_id = ?",
+        lambda ctx: (ctx["player_id"],),
+    ),
+    "player_round_bid": (
+        """SELECT s.bid FROM scores s
+           JOIN rounds r ON s.round_id = r.id
+           WHERE s.player_id = ? AND r.game_id = ? AND r.round_number = ?""",
+        lambda ctx: (ctx["player_id"], ctx["game_id"], ctx["round_number"]),
+    ),
+    "all_players": (
+        "SELECT id, name, game_id, seat_number FROM players",
+        lambda ctx: (),
+    ),
+    "player_by_id": (
+        "SELECT id, name, game_id, seat_number FROM players WHERE id = ?",
+        lambda ctx: (ctx["player_id"],),
+    ),
+    "latest_round": (
+        "SELECT id, round_number, starter_player_id FROM rounds WHERE game_id = ? ORDER BY round_number DESC LIMIT 1",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "seat_order": (
+        "SELECT id, seat_number FROM players WHERE game_id = ? ORDER BY seat_number",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "round_bidders": (
+        "SELECT player_id FROM scores WHERE round_id = ?",
+        lambda ctx: (ctx["round_id"],),
+    ),
+    "game_totals": (
+        """SELECT player_id, SUM(points) AS total_score
+           FROM scores
+           WHERE player_id IN (SELECT id FROM players WHERE game_id = ?)
+           GROUP BY player_id""",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "player_round_score": (
+        "SELECT bid, won FROM scores WHERE round_id = ? AND player_id = ?",
+        lambda ctx: (ctx["round_id"], ctx["player_id"]),
+    ),
+    "round_score_count": (
+        "SELECT COUNT(*) FROM scores WHERE round_id = ?",
+        lambda ctx: (ctx["round_id"],),
+    ),
+    "api_state": (
+        state.STATE_QUERY,
+        lambda ctx: (ctx["game_id"], ctx["game_id"]),
+    ),
+    # submit_bids_or_wins, both branches
+    "bids_game_id": (
+        "SELECT id FROM game ORDER BY created_at DESC LIMIT 1",
+        lambda ctx: (),
+    ),
+    "bids_round": (
+        "SELECT id, round_number FROM rounds WHERE game_id = ? ORDER BY round_number DESC LIMIT 1",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "bids_player_ids": (
+        "SELECT id FROM players WHERE game_id = ?",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    # recording bids, against a round with no scores yet (see SETUP)
+    "bids_insert_score": (
+        "INSERT INTO scores (round_id, player_id, bid, won, points) VALUES (?, ?, ?, ?, ?)",
+        lambda ctx: (ctx["open_round_id"], ctx["player_id"], 1, 0, 0),
+    ),
+    "bids_finish_round": (
+        "UPDATE rounds SET round_status = 'FINISH' WHERE id = ?",
+        lambda ctx: (ctx["open_round_id"],),
+    ),
+    # recording wins
+    "bids_update_won": (
+        "UPDATE scores SET won = ? WHERE round_id = ? AND player_id = ?",
+        lambda ctx: (1, ctx["round_id"], ctx["player_id"]),
+    ),
+    "bids_player_bid": (
+        "SELECT bid FROM scores WHERE round_id = ? AND player_id = ?",
+        lambda ctx: (ctx["round_id"], ctx["player_id"]),
+    ),
+    "bids_update_points": (
+        "UPDATE scores SET won = ?, points = ? WHERE round_id = ? AND player_id = ?",
+        lambda ctx: (1, 2, ctx["round_id"], ctx["player_id"]),
+    ),
+    "bids_update_game": (
+        "UPDATE game SET round_number = ? WHERE id = ?",
+        lambda ctx: (ctx["round_number"] + 1, ctx["game_id"]),
+    ),
+    "bids_ordered_player_ids": (
+        "SELECT id FROM players WHERE game_id = ? ORDER BY seat_number ASC",
+        lambda ctx: (ctx["game_id"],),
+    ),
+    "bids_insert_round": (
+        "INSERT INTO rounds (game_id, round_number, starter_player_id, round_status) VALUES (?, ?, ?, 'START')",
+        lambda ctx: (ctx["game_id"], ctx["round_number"] + 1, ctx["player_id"]),
+    ),
+    "bids_update_seat": (
+        "UPDATE players SET seat_number = ? WHERE id = ?",
+        lambda ctx: (1, ctx["player_id"]),
+    ),
+}
+
+# Queries each request issues; "per_player" ones run once for every player in the game
+HANDLERS = {
+    "GET /scores": (["latest_game", "game_players"], ["player_total", "player_round_bid"]),
+    "GET /player/{id}": (
+        ["all_players", "player_by_id", "latest_round", "seat_order", "round_bidders", "game_totals",
+         "player_round_score"],
+        [],
+    ),
+    "POST /bids (bids)": (
+        ["bids_game_id", "bids_round", "round_score_count", "bids_player_ids"],
+        ["bids_insert_score", "bids_finish_round"],
+    ),
+    "POST /bids (wins)": (
+        ["bids_game_id", "bids_round", "round_score_count", "bids_player_ids", "bids_update_game",
+         "bids_ordered_player_ids", "bids_insert_round"],
+        ["bids_update_won", "bids_player_bid", "bids_update_points", "bids_update_seat"],
+    ),
+    "GET /api/games/{id}/state": (["api_state"], []),
+}
+
+
+def open_round(conn: sqlite3.Connection, ctx: dict) -> dict:
+    """Start a new round with no scores, as submit_bids_or_wins finds it before the first bid."""
+    cur = conn.execute(
+        "INSERT INTO rounds (game_id, round_number, starter_player_id, round_status) VALUES (?, ?, ?, 'START')",
+        (ctx["game_id"], ctx["round_number"] + 1, ctx["player_id"]),
+    )
+    return {**ctx, "open_round_id": cur.lastrowid}
+
+
+# Writes that need extra rows first; setup runs inside the same rolled-back transaction
+SETUP = {
+    "bids_insert_score": open_round,
+    "bids_finish_round": open_round,
+}
+
+
+def score_round(bid: int, won: int, round_number: int) -> int:
+    # Same rules as main.score_round, kept here so the benchmark doesn't import the app
+    if bid == 0:
+        return round_number if won == 0 else -won
+    if bid == won:
+        return won * 2
+    return -abs(bid - won)
+
+
+def add_games(conn: sqlite3.Connection, start: int, count: int, rng: random.Random):
+    """Insert `count` finished games that look like real evenings of Zouk."""
+    epoch = datetime(2025, 1, 1)
+    conn.execute("BEGIN")
+    for n in range(start, start + count):
+        game_id = f"zouk-bench-{n:06d}"
+        created = epoch + timedelta(hours=n * 6, minutes=rng.randint(0, 300))
+        total_rounds = rng.randint(3, 13)
+        conn.execute(
+            "INSERT INTO game (id, created_at, round_number, game_status) VALUES (?, ?, ?, 2)",
+            (game_id, created.strftime("%Y-%m-%d %H:%M:%S"), total_rounds),
+        )
+
+        player_ids = []
+        for seat in range(1, rng.randint(3, 8) + 1):
+            cur = conn.execute(
+                "INSERT INTO players (name, game_id, seat_number) VALUES (?, ?, ?)",
+                (f"Player {seat}", game_id, seat),
+            )
+            player_ids.append(cur.lastrowid)
+
+        for round_number in range(1, total_rounds + 1):
+            cur = conn.execute(
+                "INSERT INTO rounds (game_id, round_number, starter_player_id, round_status) VALUES (?, ?, ?, 'FINISH')",
+                (game_id, round_number, player_ids[round_number % len(player_ids)]),
+            )
+            round_id = cur.lastrowid
+            rows = []
+            for pid in player_ids:
+                bid = rng.randint(0, round_number)
+                won = bid if rng.random() < 0.4 else rng.randint(0, round_number)
+                rows.append((round_id, pid, bid, won, score_round(bid, won, round_number)))
+            conn.executemany(
+                "INSERT INTO scores (round_id, player_id, bid, won, points) VALUES (?, ?, ?, ?, ?)", rows
+            )
+    conn.commit()
+
+
+def latest_context(conn: sqlite3.Connection) -> dict:
+    game_id, round_number = conn.execute(
+        "SELECT id, round_number FROM game ORDER BY created_at DESC LIMIT 1"
+    ).fetchone()
+    round_id = conn.execute(
+        "SELECT id FROM rounds WHERE game_id = ? ORDER BY round_number DESC LIMIT 1", (game_id,)
+    ).fetchone()[0]
+    player_ids = [row[0] for row in conn.execute("SELECT id FROM players WHERE game_id = ?", (game_id,))]
+    return {
+        "game_id": game_id,
+        "round_number": round_number,
+        "round_id": round_id,
+        "player_id": player_ids[0],
+        "players": len(player_ids),
+    }
+
+
+def is_write(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))
+
+
+def time_queries(conn: sqlite3.Connection, ctx: dict, repeat: int) -> dict[str, dict]:
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        write = is_write(sql)
+        args = params(ctx) if name not in SETUP else None
+        samples = []
+        for i in range(repeat + 1):
+            if write:
+                conn.execute("BEGIN")
+            if name in SETUP:
+                args = params(SETUP[name](conn, ctx))
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            elapsed = (time.perf_counter() - start) * 1000
+            if write:
+                conn.execute("ROLLBACK")
+            if i:  # the first run only warms the page cache
+                samples.append(elapsed)
+        samples.sort()
+        results[name] = {
+            "median_ms": statistics.median(samples),
+            "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+    return results
+
+
+def handler_cost(timings: dict[str, dict], players: int) -> dict[str, float]:
+    return {
+        handler: sum(timings[q]["median_ms"] for q in once) + players * sum(timings[q]["median_ms"] for q in per_player)
+        for handler, (once, per_player) in HANDLERS.items()
+    }
+
+
+def query_plans(conn: sqlite3.Connection, ctx: dict) -> dict[str, list[str]]:
+    plans = {}
+    for name, (sql, params) in QUERIES.items():
+        if name in SETUP:
+            conn.execute("BEGIN")
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params(SETUP[name](conn, ctx))).fetchall()
+            conn.execute("ROLLBACK")
+        else:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params(ctx)).fetchall()
+        plans[name] = [row[3] for row in rows]
+    return plans
+
+
+def table_sizes(conn: sqlite3.Connection) -> dict[str, int]:
+    return {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("game", "players", "rounds", "scores")}
+
+
+def print_report(steps: list[dict], plans: dict[str, list[str]]):
+    sizes = "".join(f"{step['tables']['scores']:>12,}" for step in steps)
+    sections = (
+        ("query, median ms", {name: [step["queries"][name]["median_ms"] for step in steps] for name in QUERIES}),
+        ("request, sum of medians ms", {name: [step["handlers"][name] for step in steps] for name in HANDLERS}),
+    )
+    for title, rows in sections:
+        print(f"\n{title:<28}{sizes}{'growth':>10}   (columns: rows in scores)")
+        for name, values in rows.items():
+            growth = values[-1] / values[0] if values[0] else 0
+            print(f"{name:<28}" + "".join(f"{v:>12.3f}" for v in values) + f"{growth:>9.1f}x")
+
+    print("\nQuery plans at the largest size (⚠ = full table scan):")
+    for name, lines in plans.items():
+        print(f"  {name}")
+        for line in lines:
+            flag = "⚠" if line.startswith("SCAN") and "INDEX" not in line else " "
+            print(f"    {flag} {line}")
+
+
+def run(db_path: pathlib.Path, sizes: list[int], repeat: int, seed: int) -> dict:
+    if db_path.resolve() == pathlib.Path(db.DB_PATH).resolve():
+        raise SystemExit("❌ Refusing to benchmark against the live zouk.db, pick a scratch path")
+
+    db_path.unlink(missing_ok=True)
+    db.DB_PATH = db_path
+    asyncio.run(db.init_db())
+
+    rng = random.Random(seed)
+    # Autocommit mode, transactions are opened explicitly with BEGIN
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    steps = []
+    games = 0
+    for size in sorted(sizes):
+        print(f"⚙️ Generating games {games + 1}..{size}")
+        add_games(conn, games, size - games, rng)
+        games = size
+        conn.execute("ANALYZE")
+
+        ctx = latest_context(conn)
+        timings = time_queries(conn, ctx, repeat)
+        steps.append({
+            "games": size,
+            "tables": table_sizes(conn),
+            "queries": timings,
+            "handlers": handler_cost(timings, ctx["players"]),
+        })
+
+    plans = query_plans(conn, ctx)
+    conn.close()
+    return {"steps": steps, "plans": plans}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the Zouk SQL queries against synthetic history")
+    parser.add_argument("--db", type=pathlib.Path, default=DEFAULT_DB, help="scratch database, recreated on every run")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma separated game counts to measure at")
+    parser.add_argument("--repeat", type=int, default=50, help="timed executions per query")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=pathlib.Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.db, [int(s) for s in args.sizes.split(",")], args.repeat, args.seed)
+    print_report(results["steps"], results["plans"])
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\n✅ Results written to {args.json}")
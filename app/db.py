@@ -49,5 +49,12 @@ async def init_db():
             );
         """)
 
+        # Every page looks rows up by game, round or player; without these each lookup scans the table
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_game_created ON game (created_at)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_players_game ON players (game_id, seat_number)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_rounds_game ON rounds (game_id, round_number)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_scores_round_player ON scores (round_id, player_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (player_id)")
+
         await db.commit()
         
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+# Settings come from the environment so they can be changed per deployment, e.g.
+#   ZOUK_LOG_LEVEL=DEBUG ZOUK_LOG_FORMAT=text ZOUK_LOG_SAMPLE="checkin=1" uvicorn app.main:app
+# Sample and rate maps are "event=value" pairs separated by commas, "*" sets the default.
+LOG_LEVEL = os.environ.get("ZOUK_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("ZOUK_LOG_FORMAT", "json")
+LOG_SAMPLE = os.environ.get("ZOUK_LOG_SAMPLE", "checkin=0.1")
+LOG_RATE = os.environ.get("ZOUK_LOG_RATE", "*=50")
+
+logger = logging.getLogger("zouk")
+logger.propagate = False
+
+# uvicorn's own loggers write to stdout on the event loop; start() moves them onto the queue too
+UVICORN_LOGGERS = ("uvicorn.access", "uvicorn.error")
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: logging.handlers.QueueListener | None = None
+_saved: dict[str, tuple[list, bool]] = {}
+
+
+def _parse_map(spec: str) -> dict[str, float]:
+    values = {}
+    for item in spec.split(","):
+        key, sep, value = item.partition("=")
+        if sep and key.strip():
+            values[key.strip()] = float(value)
+    return values
+
+
+class EventFilter(logging.Filter):
+    """Drop records by per-event sample rate, then cap each event to N records per second."""
+
+    def __init__(self, sample: dict[str, float], rate: dict[str, float]):
+        super().__init__()
+        self.sample = sample
+        self.rate = rate
+        self.windows: dict[str, list] = {}  # event -> [window_start, count, dropped]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", record.name)
+
+        sample = self.sample.get(event, self.sample.get("*", 1.0))
+        if sample < 1.0 and random.random() >= sample:
+            return False
+
+        limit = self.rate.get(event, self.rate.get("*"))
+        if limit is None:
+            return True
+
+        now = time.monotonic()
+        window = self.windows.setdefault(event, [now, 0, 0])
+        if now - window[0] >= 1.0:
+            window[0], window[1] = now, 0
+        if window[1] >= limit:
+            window[2] += 1
+            return False
+
+        window[1] += 1
+        if window[2]:
+            # Let the reader know how much was hidden since the last record of this event
+            record.fields = {**getattr(record, "fields", {}), "dropped": window[2]}
+            window[2] = 0
+        return True
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    # Records from other libraries (uvicorn) carry a plain message instead of fields
+    if hasattr(record, "event"):
+        return getattr(record, "fields", {})
+    return {**getattr(record, "fields", {}), "msg": record.getMessage()}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "event": getattr(record, "event", record.name),
+            **_fields(record),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{k}={v}" for k, v in _fields(record).items())
+        line = f"{self.formatTime(record)} {record.levelname} {getattr(record, 'event', record.name)} {fields}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line.rstrip()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    # The stock handler formats the message on the calling thread; leave all
+    # formatting to the listener so the event loop only pays for an enqueue.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.exc_text = None
+        return record
+
+
+def start():
+    """Attach the queue handler to our and uvicorn's loggers and start the background writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+
+    handler = _QueueHandler(_queue)
+    handler.addFilter(EventFilter(_parse_map(LOG_SAMPLE), _parse_map(LOG_RATE)))
+
+    logger.handlers[:] = [handler]
+    logger.setLevel(LOG_LEVEL)
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        _saved[name] = (uvicorn_logger.handlers[:], uvicorn_logger.propagate)
+        uvicorn_logger.handlers[:] = [handler]
+        uvicorn_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(_queue, stream)
+    _listener.start()
+
+
+def stop():
+    """Give uvicorn its handlers back, flush anything still queued and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    for name, (handlers, propagate) in _saved.items():
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers[:] = handlers
+        uvicorn_logger.propagate = propagate
+    _saved.clear()
+    _listener.stop()
+    _listener = None
+
+
+def event(name: str, level: int = logging.INFO, /, **fields):
+    """Log a structured event, e.g. event("ws_connect", clients=3)."""
+    if logger.isEnabledFor(level):
+        logger.log(level, name, extra={"event": name, "fields": fields})
@@ -1,36 +1,42 @@
 import os
+import json
 import base64
 import qrcode
 import signal
 import random
+import logging
 import asyncio
 import pathlib
 import aiosqlite
-from app import db
+from app import db, log, state, assets, profiling
 from io import BytesIO
 from typing import List
 from datetime import datetime
 from contextlib import asynccontextmanager
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi import FastAPI, Request, Form, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi import FastAPI, HTTPException, Request, Form, WebSocket, WebSocketDisconnect
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("⚙️ Initializing database...")
+    log.start()
+    log.event("db_init")
     await db.init_db()
-    print("✅ Database ready.")
+    log.event("db_ready")
     yield
-    print("🛑 FastAPI server is shutting down...")
+    log.event("shutdown")
+    log.stop()
 
 app = FastAPI(lifespan=lifespan)
+profiling.install(app)
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 templates.env.globals["now"] = datetime.now
+templates.env.globals["static_url"] = assets.static_url
+templates.env.globals["asset_manifest"] = assets.manifest
 
-app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+app.mount("/static", assets.StaticAssets(directory=str(BASE_DIR / "static")), name="static")
 
 # Store active connections globally
 active_connections: list[WebSocket] = []
@@ -97,6 +103,7 @@ async def join_post(name: str = Form(...)):
         )
         await conn.commit()
         player_id = cursor.lastrowid
+    state.invalidate()
 
     return RedirectResponse(url=f"/player/{player_id}", status_code=302)
 
@@ -161,6 +168,7 @@ async def reorder_players(request: Request):
             await conn.execute("UPDATE players SET seat_number = ? WHERE id = ?", (p2["seat_number"], p1["id"]))
             await conn.execute("UPDATE players SET seat_number = ? WHERE id = ?", (p1["seat_number"], p2["id"]))
             await conn.commit()
+            state.invalidate()
 
     return RedirectResponse(url="/host", status_code=302)
 
@@ -180,6 +188,7 @@ async def create_new_game():
     async with aiosqlite.connect(db.DB_PATH) as conn:
         await conn.execute("INSERT INTO game (id, round_number, game_status) VALUES (?, ?, ?)", (game_id, 1, 0))
         await conn.commit()
+    state.invalidate()
     return RedirectResponse(url="/host", status_code=302)
 
 @app.post("/game/start")
@@ -617,17 +626,38 @@ async def show_scores(request: Request):
         "current_page": "scores"
     })
 
+# Read-only game state for scoreboards and native clients. Pass ?since=<v> to get
+# only what changed since that version, use "latest" as the id for the newest game.
+@app.get("/api/games/{game_id}/state")
+async def game_state(request: Request, game_id: str, since: str | None = None):
+    snapshot = await state.get_snapshot(game_id)
+
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    etag = f'"{snapshot["v"]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if state.etag_matches(request.headers.get("if-none-match"), etag) or since == snapshot["v"]:
+        return Response(status_code=304, headers=headers)
+
+    payload = (since and state.delta(snapshot, since)) or snapshot
+    return Response(
+        content=json.dumps(payload, separators=(",", ":"), ensure_ascii=False),
+        media_type="application/json",
+        headers=headers,
+    )
+
 @app.websocket("/socket/scores")
 async def scores_websocket(websocket: WebSocket):
     await websocket.accept()
     active_connections.append(websocket)
-    print(f"📡 WebSocket connected — total: {len(active_connections)}")
+    log.event("ws_connect", clients=len(active_connections))
     try:
         while True:
             await websocket.receive_text()  # Keep connection open
     except WebSocketDisconnect:
         active_connections.remove(websocket)
-        print(f"🔌 WebSocket disconnected — total: {len(active_connections)}")
+        log.event("ws_disconnect", clients=len(active_connections))
 
 async def broadcast_scores_update():
     for connection in active_connections:
@@ -638,12 +668,13 @@ async def broadcast_scores_update():
 
 # Prevent accidental cascade during page reloads or solo play
 async def safe_broadcast_scores_update(force=False):
-    print(f"🧩 WebSocket clients connected: {len(active_connections)}")
+    # Game-changing writes end here, so drop the cached API state along with notifying clients
+    state.invalidate()
     if force or len(active_connections) > 1:
-        print("📣 Broadcasting score update")
+        log.event("broadcast", clients=len(active_connections))
         await broadcast_scores_update()
     else:
-        print("🔇 Suppressed broadcast — not enough active clients")
+        log.event("broadcast_suppressed", logging.DEBUG, clients=len(active_connections))
 
 # Player poll for keeping track of round status     
 @app.get("/player/{id}/checkin")
@@ -657,10 +688,10 @@ async def round_check(id: int):
         """, (id,))
         row = await cur.fetchone()
         if row:
-            print("Player check-in for:", row["name"])
+            log.event("checkin", player_id=id, name=row["name"], round_number=row["round_number"])
             return {"round_number": row["round_number"]}
         else:
-            print("❌ Player not found for ID:", id)
+            log.event("checkin_miss", logging.WARNING, player_id=id)
             return {"round_number": 0}
 
 @app.post("/game/close")
@@ -684,6 +715,7 @@ async def reset_all():
         await conn.execute("DROP TABLE IF EXISTS game")
         await conn.commit()
     await db.init_db()
+    state.invalidate()
     return RedirectResponse(url="/host", status_code=302)
 
 @app.post("/reset-game")
@@ -694,11 +726,12 @@ async def reset_keep_players():
         await conn.commit()
         await conn.execute("UPDATE game SET round_number = 1")
         await conn.commit()
+    state.invalidate()
     return RedirectResponse(url="/host", status_code=302)
 
 @app.get("/shutdown")
 async def shutdown_route():
-    print("🔻 Shutdown triggered via route at", datetime.now())
+    log.event("shutdown_requested", logging.WARNING)
     asyncio.create_task(delayed_shutdown())
     return {"message": "Shutting down..."}
 
@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+import asyncio
+import random
+import itertools
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+# Opt-in request profiler. Nothing is installed unless ZOUK_PROFILE=1, e.g.
+#   ZOUK_PROFILE=1 ZOUK_PROFILE_SAMPLE=0 ZOUK_PROFILE_SLOW_MS=150 uvicorn app.main:app
+# SAMPLE keeps that fraction of requests; SLOW_MS > 0 profiles every request and
+# also keeps any that ran longer than the threshold.
+PROFILE_ENABLED = os.environ.get("ZOUK_PROFILE", "0") == "1"
+PROFILE_SAMPLE = float(os.environ.get("ZOUK_PROFILE_SAMPLE", "0.1"))
+PROFILE_SLOW_MS = float(os.environ.get("ZOUK_PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.environ.get("ZOUK_PROFILE_INTERVAL_MS", "5"))
+PROFILE_KEEP = int(os.environ.get("ZOUK_PROFILE_KEEP", "50"))
+
+SKIP_PREFIXES = ("/static", "/admin/profiles")
+
+class Trace:
+    def __init__(self, trace_id: int, method: str, path: str):
+        self.id = trace_id
+        self.method = method
+        self.path = path
+        self.started = datetime.now()
+        self.status = None
+        self.duration_ms = 0.0
+        self.stacks: Counter = Counter()
+        # The task serving this request, so samples from other requests on the same loop are not mixed in
+        self.task = asyncio.current_task()
+        self.loop = asyncio.get_running_loop()
+        self.thread = threading.get_ident()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started": self.started.isoformat(timespec="seconds"),
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": sum(self.stacks.values()),
+        }
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def thread_stack(frame) -> list[str]:
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame))
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def await_stack(coro) -> list[str]:
+    """Where a suspended task is parked: its coroutine chain down to the awaited future."""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            stack.append(type(coro).__name__)
+            break
+        stack.append(frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+class Sampler(threading.Thread):
+    """Background thread that samples each profiled request's own task.
+
+    A request whose task is running on the event loop gets the loop thread's stack,
+    one that is suspended (waiting on SQLite, a socket...) gets the chain of awaits it is
+    parked in. Either way a sample only lands in the trace of the request it belongs to.
+    """
+
+    def __init__(self, interval_ms: float):
+        super().__init__(name="zouk-profiler", daemon=True)
+        self.interval = interval_ms / 1000
+        self.active: dict[int, Trace] = {}
+        self.lock = threading.Lock()
+        self.busy = threading.Event()
+
+    def add(self, trace: Trace):
+        with self.lock:
+            self.active[trace.id] = trace
+            self.busy.set()
+
+    def remove(self, trace: Trace):
+        with self.lock:
+            self.active.pop(trace.id, None)
+            if not self.active:
+                self.busy.clear()
+
+    def run(self):
+        while True:
+            self.busy.wait()
+            frames = sys._current_frames()
+            with self.lock:
+                for trace in self.active.values():
+                    if asyncio.current_task(trace.loop) is trace.task:
+                        stack = ["running", *thread_stack(frames.get(trace.thread))]
+                    else:
+                        stack = ["awaiting", *await_stack(trace.task.get_coro())]
+                    trace.stacks[tuple(stack)] += 1
+            time.sleep(self.interval)
+
+
+class ProfilerMiddleware:
+    """ASGI middleware that profiles a sample of HTTP requests into a bounded ring."""
+
+    def __init__(self, app, sampler: Sampler, traces: deque):
+        self.app = app
+        self.sampler = sampler
+        self.traces = traces
+        self.ids = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(SKIP_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        sampled = random.random() < PROFILE_SAMPLE
+        if not sampled and PROFILE_SLOW_MS <= 0:
+            return await self.app(scope, receive, send)
+
+        trace = Trace(next(self.ids), scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.status = message["status"]
+            await send(message)
+
+        self.sampler.add(trace)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            trace.duration_ms = (time.perf_counter() - start) * 1000
+            self.sampler.remove(trace)
+            if sampled or trace.duration_ms >= PROFILE_SLOW_MS:
+                self.traces.append(trace)
+
+
+def collapsed(trace: Trace) -> str:
+    """Brendan Gregg's folded format, one "frame;frame;frame count" line per unique stack."""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in trace.stacks.most_common())
+
+
+def speedscope(trace: Trace) -> dict:
+    frames: dict[str, int] = {}
+    samples, weights = [], []
+    for stack, count in trace.stacks.items():
+        samples.append([frames.setdefault(name, len(frames)) for name in stack])
+        weights.append(count * PROFILE_INTERVAL_MS)
+
+    name = f"{trace.method} {trace.path} #{trace.id}"
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "zouk-game",
+        "shared": {"frames": [{"name": frame} for frame in frames]},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def install(app: FastAPI):
+    """Register the middleware and admin routes when ZOUK_PROFILE=1, otherwise do nothing."""
+    if not PROFILE_ENABLED:
+        return
+
+    traces: deque[Trace] = deque(maxlen=PROFILE_KEEP)
+    sampler = Sampler(PROFILE_INTERVAL_MS)
+    sampler.start()
+    app.add_middleware(ProfilerMiddleware, sampler=sampler, traces=traces)
+
+    def find(trace_id: int) -> Trace:
+        trace = next((t for t in traces if t.id == trace_id), None)
+        if trace is None:
+            raise HTTPException(status_code=404, detail="Trace not found")
+        return trace
+
+    @app.get("/admin/profiles")
+    async def list_profiles():
+        return [trace.summary() for trace in reversed(traces)]
+
+    @app.get("/admin/profiles/{trace_id}")
+    async def download_profile(trace_id: int, format: str = "speedscope"):
+        trace = find(trace_id)
+        filename = f"zouk-{trace.id}"
+        if format == "collapsed":
+            return PlainTextResponse(collapsed(trace), headers={
+                "Content-Disposition": f'attachment; filename="{filename}.folded"'
+            })
+        if format == "speedscope":
+            return JSONResponse(speedscope(trace), headers={
+                "Content-Disposition": f'attachment; filename="{filename}.speedscope.json"'
+            })
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'speedscope'")
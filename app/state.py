@@ -0,0 +1,174 @@
+import os
+import json
+import hashlib
+import aiosqlite
+from app import db
+from collections import OrderedDict
+
+# Compact game snapshot for machine clients (scoreboard TVs, native apps).
+# Everything comes from one statement: the game row, its latest round, every
+# player in seat order with their bid/won for that round and running total.
+STATE_QUERY = """
+    SELECT g.id AS game_id, g.round_number AS game_round, g.game_status,
+           r.id AS round_id, r.round_number, r.round_status, r.starter_player_id,
+           p.id AS player_id, p.name, p.seat_number,
+           s.bid, s.won, t.total
+    FROM game g
+    LEFT JOIN rounds r ON r.id = (
+        SELECT id FROM rounds WHERE game_id = g.id ORDER BY round_number DESC LIMIT 1
+    )
+    LEFT JOIN players p ON p.game_id = g.id
+    LEFT JOIN scores s ON s.round_id = r.id AND s.player_id = p.id
+    LEFT JOIN (
+        SELECT player_id, SUM(points) AS total
+        FROM scores
+        WHERE player_id IN (SELECT id FROM players WHERE game_id = ?)
+        GROUP BY player_id
+    ) t ON t.player_id = p.id
+    WHERE g.id = ?
+    ORDER BY p.seat_number ASC
+"""
+
+LATEST_GAME_QUERY = "SELECT id FROM game ORDER BY created_at DESC LIMIT 1"
+
+# Latest snapshot per requested id ("latest" included), served from memory while the
+# database file is unchanged. The file signature catches writes from anywhere (another
+# worker, SQLite Viewer); invalidate() and the generation counter cover this process's
+# own writes even where the filesystem's mtime is too coarse to tell them apart.
+current: dict[str, tuple[tuple, dict]] = {}
+generation = 0
+
+# Recent snapshots per game, so clients can ask for a delta since the version they hold
+HISTORY_PER_GAME = 32
+HISTORY_GAMES = 8
+history: OrderedDict[str, OrderedDict[str, dict]] = OrderedDict()
+
+
+def invalidate():
+    """Call after any write to game, players, rounds or scores."""
+    global generation
+    generation += 1
+    current.clear()
+
+
+def db_signature() -> tuple:
+    """Changes whenever a commit lands in the database file (or its WAL)."""
+    signature = []
+    for path in (str(db.DB_PATH), f"{db.DB_PATH}-wal"):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+async def get_snapshot(game_id: str) -> dict | None:
+    # Taken before the query, so a write that lands while loading makes the entry stale
+    signature = db_signature()
+    cached = current.get(game_id)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    started = generation
+    async with aiosqlite.connect(db.DB_PATH) as conn:
+        conn.row_factory = aiosqlite.Row
+        snapshot = await load_snapshot(conn, game_id)
+
+    if snapshot and started == generation:
+        current.pop(game_id, None)
+        if len(current) >= HISTORY_GAMES:
+            current.pop(next(iter(current)))
+        current[game_id] = (signature, snapshot)
+    return snapshot
+
+
+async def load_snapshot(conn: aiosqlite.Connection, game_id: str) -> dict | None:
+    if game_id == "latest":
+        cur = await conn.execute(LATEST_GAME_QUERY)
+        row = await cur.fetchone()
+        if not row:
+            return None
+        game_id = row["id"]
+
+    cur = await conn.execute(STATE_QUERY, (game_id, game_id))
+    rows = await cur.fetchall()
+    if not rows:
+        return None
+
+    first = rows[0]
+    players = [{
+        "id": row["player_id"],
+        "name": row["name"],
+        "seat": row["seat_number"],
+        "bid": row["bid"],
+        "won": row["won"],
+        "total": row["total"] or 0,
+    } for row in rows if row["player_id"] is not None]
+
+    # Same rotation as /bids: play order starts at the round's starter
+    ids = [p["id"] for p in players]
+    starter_id = first["starter_player_id"]
+    if starter_id in ids:
+        index = ids.index(starter_id)
+        ids = ids[index:] + ids[:index]
+
+    snapshot = {
+        "game": first["game_id"],
+        "status": first["game_status"],
+        "round": {
+            "id": first["round_id"],
+            "number": first["round_number"],
+            "status": first["round_status"],
+            "starter": starter_id,
+        } if first["round_id"] is not None else None,
+        "order": ids,
+        "players": players,
+    }
+    snapshot["v"] = version(snapshot)
+    remember(snapshot)
+    return snapshot
+
+
+def version(snapshot: dict) -> str:
+    encoded = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against our ETag, as RFC 9110 asks for."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def remember(snapshot: dict):
+    versions = history.setdefault(snapshot["game"], OrderedDict())
+    history.move_to_end(snapshot["game"])
+    versions[snapshot["v"]] = snapshot
+    versions.move_to_end(snapshot["v"])
+    while len(versions) > HISTORY_PER_GAME:
+        versions.popitem(last=False)
+    while len(history) > HISTORY_GAMES:
+        history.popitem(last=False)
+
+
+def delta(snapshot: dict, since: str) -> dict | None:
+    """Changes between an older version and this snapshot, or None if that version is unknown."""
+    old = history.get(snapshot["game"], {}).get(since)
+    if old is None:
+        return None
+
+    old_players = {p["id"]: p for p in old["players"]}
+    new_ids = {p["id"] for p in snapshot["players"]}
+    changes = {"v": snapshot["v"], "since": since}
+    for key in ("status", "round", "order"):
+        if snapshot[key] != old[key]:
+            changes[key] = snapshot[key]
+    changes["players"] = [p for p in snapshot["players"] if old_players.get(p["id"]) != p]
+    changes["removed"] = [pid for pid in old_players if pid not in new_ids]
+    return changes
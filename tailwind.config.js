@@ -0,0 +1,8 @@
+/** Used by `python -m app.assets` to build app/static/tailwind.css */
+module.exports = {
+  content: ["./app/templates/**/*.html"],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};